@@ -5,19 +5,75 @@ from . import lastools,utils
 import laspy
 
 import numpy as np
-import glob,os,simplekml,itertools
+import glob,os,itertools
+from xml.sax.saxutils import escape
+from collections import defaultdict
 import matplotlib.pyplot as plt
 import scipy.spatial as scp
 from scipy.spatial import cKDTree
-from sklearn.decomposition import PCA
 from sklearn.cluster import DBSCAN
 from sklearn.preprocessing import MinMaxScaler
 import shapely
 import shapely.ops
 from shapely.geometry import Polygon
+from shapely.strtree import STRtree
 from joblib import Parallel,delayed
 
-def correction3D(pt_app,depthApp,pt_shot=[],vectorApp=[],indRefr=1.333):
+try:
+    import numba
+except ImportError:
+    # numba is optional, bathymetric correction falls back on numpy
+    numba=None
+
+if numba is not None:
+    @numba.njit(parallel=True,fastmath=True,error_model='numpy',cache=True)
+    def _correct3d_kernel(pt_app,vect,depthApp,n,one,out_coords,out_depth):
+        # fused loop of correction3D : each vector is read once and each point written once
+        # n and one have the dtype of the arrays, an integer literal would promote float32 to float64
+        # sin is taken from the horizontal component, 1-cos² loses precision near nadir,
+        # and 1-sin² is clamped at 0 since fastmath can make it slightly negative
+        zero=one-one
+        for i in numba.prange(vect.shape[0]):
+            x,y,z=vect[i,0],vect[i,1],vect[i,2]
+            nxy=np.sqrt(x*x+y*y)
+            nrm=np.sqrt(nxy*nxy+z*z)
+            gis=np.arctan2(x,y)
+            cA=z/nrm
+            sA=nxy/nrm
+            sT=sA/n
+            cT=np.sqrt(max(one-sT*sT,zero))
+            dT=depthApp[i]*cA/(n*cT)
+            dP=depthApp[i]*sA/cA-dT*sT/cT
+            out_coords[i,0]=pt_app[i,0]+dP*np.sin(gis)
+            out_coords[i,1]=pt_app[i,1]+dP*np.cos(gis)
+            out_coords[i,2]=pt_app[i,2]+dT-depthApp[i]
+            out_depth[i]=dT
+
+    @numba.njit(parallel=True,fastmath=True,error_model='numpy',cache=True)
+    def _correct_vect_kernel(vect,n,one,out_vect):
+        # fused loop of correction_vect
+        zero=one-one
+        for i in numba.prange(vect.shape[0]):
+            x,y,z=vect[i,0],vect[i,1],vect[i,2]
+            nxy=np.sqrt(x*x+y*y)
+            nrm=np.sqrt(nxy*nxy+z*z)
+            gis=np.arctan2(x,y)
+            sT=nxy/(nrm*n)
+            cT=np.sqrt(max(one-sT*sT,zero))
+            out_vect[i,0]=nrm/n*sT*np.sin(gis)
+            out_vect[i,1]=nrm/n*sT*np.cos(gis)
+            out_vect[i,2]=nrm/n*cT
+
+def _set_numba_threads(workers):
+    # number of threads for numba kernels, -1 for all cpu, returns previous value to restore it
+    previous=numba.get_num_threads()
+    if workers>0:
+        numba.set_num_threads(min(workers,numba.config.NUMBA_NUM_THREADS))
+    else:
+        numba.set_num_threads(numba.config.NUMBA_NUM_THREADS)
+    return previous
+
+def correction3D(pt_app,depthApp,pt_shot=[],vectorApp=[],indRefr=1.333,workers=-1):
     """Bathymetric correction 3D
 
     Args:
@@ -26,59 +82,107 @@ def correction3D(pt_app,depthApp,pt_shot=[],vectorApp=[],indRefr=1.333):
         pt_shot (list, optional): coordinates for each laser shot, useful in discrete mode. Defaults to [].
         vectorApp (list, optional): apparent vector shot, useful in fwf mode. Defaults to [].
         indRefr (float, optional): water refraction indice. Defaults to 1.333.
+        workers (int, optional): number of threads used with numba, set 1 when called inside joblib Parallel. Defaults to -1 (all cpu).
 
     Raises:
         ValueError: pt_shot and vectorApp shouldn't be Null both
+        ValueError: pt_app, depthApp and pt_shot or vectorApp must have the same length
 
     Returns:
         true point coordinates (numpy.ndarray)
         true depth (numpy.ndarray)
+
+    Computation is done in float32 if all inputs are float32, in float64 otherwise.
+    In float32, output precision depends on coordinate magnitude (about 0.5 m for a northing around 6.7e6),
+    so remove a coordinate offset from pt_app (and pt_shot) before using float32.
     """
     if len(pt_shot)>0 and len(vectorApp)==0:
         #discret mode
         vectApp=pt_shot-pt_app
     elif len(pt_shot)==0 and len(vectorApp)>0:
-        #fwf mode
-        vectApp=np.copy(vectorApp)
+        #fwf mode, vectorApp is only read so no copy is needed
+        vectApp=np.asarray(vectorApp)
     else:
         raise ValueError("pt_shot and vectorApp shouldn't be Null both")
-    vectApp_norm=np.linalg.norm(vectApp,axis=1)
 
-    # compute "gisement" with formula that removes ambiguity of pi radians on the calculation of 'arctan'
-    gisement_vect=2*np.arctan(vectApp[:,0]/(np.linalg.norm(vectApp[:,0:2],axis=1)+vectApp[:,1]))
-    thetaApp=np.arccos(vectApp[:,2]/vectApp_norm)
-    thetaTrue=np.arcsin(np.sin(thetaApp)/indRefr)
-    depthTrue=depthApp*np.cos(thetaApp)/(indRefr*np.cos(thetaTrue))
+    # numba kernel doesn't check bounds, lengths must be checked before
+    if not len(pt_app)==len(depthApp)==len(vectApp):
+        raise ValueError("pt_app, depthApp and pt_shot or vectorApp must have the same length")
+
+    dtype=np.result_type(pt_app,vectApp,depthApp,np.float32)
+    indRefr=dtype.type(indRefr)
+    if numba is not None:
+        vectApp=np.ascontiguousarray(vectApp,dtype=dtype)
+        coords=np.empty_like(vectApp)
+        depthTrue=np.empty(len(vectApp),dtype=dtype)
+        previous=_set_numba_threads(workers)
+        try:
+            _correct3d_kernel(np.ascontiguousarray(pt_app,dtype=dtype),vectApp,
+                              np.ascontiguousarray(depthApp,dtype=dtype),indRefr,dtype.type(1),coords,depthTrue)
+        finally:
+            numba.set_num_threads(previous)
+        return coords,depthTrue
 
-    distPlan=depthApp*np.tan(thetaApp)-depthTrue*np.tan(thetaTrue)
-    coords=np.vstack([pt_app[:,0]+distPlan*np.sin(gisement_vect),
-                      pt_app[:,1]+distPlan*np.cos(gisement_vect),
-                      pt_app[:,2]+depthTrue-depthApp])
-
-    return np.transpose(coords),depthTrue
+    vectApp_norm=np.linalg.norm(vectApp,axis=1)
 
-def correction_vect(vectorApp,indRefr=1.333):
+    # compute "gisement" with arctan2 that removes ambiguity of pi radians on the calculation of 'arctan'
+    gisement_vect=np.arctan2(vectApp[:,0],vectApp[:,1])
+    # sin and cos of apparent and true incidence angles, derived from Snell's law without arccos/arcsin
+    # sin is taken from the horizontal component, 1-cos² loses precision near nadir
+    cA=vectApp[:,2]/vectApp_norm
+    sA=np.hypot(vectApp[:,0],vectApp[:,1])/vectApp_norm
+    sT=sA/indRefr
+    cT=np.sqrt(1-sT*sT)
+    depthTrue=depthApp*cA/(indRefr*cT)
+
+    distPlan=depthApp*sA/cA-depthTrue*sT/cT
+    coords=np.empty((len(pt_app),3),dtype=dtype)
+    coords[:,0]=pt_app[:,0]+distPlan*np.sin(gisement_vect)
+    coords[:,1]=pt_app[:,1]+distPlan*np.cos(gisement_vect)
+    coords[:,2]=pt_app[:,2]+depthTrue-depthApp
+
+    return coords,depthTrue
+
+def correction_vect(vectorApp,indRefr=1.333,workers=-1):
     """bathymetric correction only for vector shot (in fwf mode)
 
     Args:
         vectorApp (numpy.ndarray): apparent vector shot, useful in fwf mode
         indRefr (float, optional): water refraction indice. Defaults to 1.333.
+        workers (int, optional): number of threads used with numba, set 1 when called inside joblib Parallel. Defaults to -1 (all cpu).
 
     Returns:
         true vector shot (numpy.ndarray)
+
+    Computation is done in float32 if vectorApp is float32, in float64 otherwise.
     """
     # bathymetric laser shot correction for fwf lidar data 
+    dtype=np.result_type(vectorApp,np.float32)
+    indRefr=dtype.type(indRefr)
+    if numba is not None:
+        vectorApp=np.ascontiguousarray(vectorApp,dtype=dtype)
+        vectTrue=np.empty_like(vectorApp)
+        previous=_set_numba_threads(workers)
+        try:
+            _correct_vect_kernel(vectorApp,indRefr,dtype.type(1),vectTrue)
+        finally:
+            numba.set_num_threads(previous)
+        return vectTrue
+
     vectApp_norm=np.linalg.norm(vectorApp,axis=1)
     vectTrue_norm=vectApp_norm/indRefr
 
-    # compute "gisement" with formula that removes ambiguity of pi radians on the calculation of 'arctan'
-    gisement_vect=2*np.arctan(vectorApp[:,0]/(np.linalg.norm(vectorApp[:,0:2],axis=1)+vectorApp[:,1]))
-    thetaApp=np.arccos(vectorApp[:,2]/vectApp_norm)
-    thetaTrue=np.arcsin(np.sin(thetaApp)/indRefr)
-    vectTrue=np.vstack([vectTrue_norm*np.sin(thetaTrue)*np.sin(gisement_vect),
-                         vectTrue_norm*np.sin(thetaTrue)*np.cos(gisement_vect),
-                         vectTrue_norm*np.cos(thetaTrue)])
-    return np.transpose(vectTrue)
+    # compute "gisement" with arctan2 that removes ambiguity of pi radians on the calculation of 'arctan'
+    gisement_vect=np.arctan2(vectorApp[:,0],vectorApp[:,1])
+    # sin and cos of true incidence angle, derived from Snell's law without arccos/arcsin
+    # sin is taken from the horizontal component, 1-cos² loses precision near nadir
+    sT=np.hypot(vectorApp[:,0],vectorApp[:,1])/(vectApp_norm*indRefr)
+    cT=np.sqrt(1-sT*sT)
+    vectTrue=np.empty((len(vectorApp),3),dtype=dtype)
+    vectTrue[:,0]=vectTrue_norm*sT*np.sin(gisement_vect)
+    vectTrue[:,1]=vectTrue_norm*sT*np.cos(gisement_vect)
+    vectTrue[:,2]=vectTrue_norm*cT
+    return vectTrue
 
 #======================================#
 
@@ -176,7 +280,7 @@ class Alphashape(object):
                 plt.fill(a[0],a[1],alpha=2,edgecolor="red",facecolor="blue")
         plt.show()
 
-def computeDBSCAN(filepath,maxdist=1,minsamples=5):
+def computeDBSCAN(filepath,maxdist=1,minsamples=5,algorithm='ball_tree',leaf_size=32,n_jobs=46):
     """make Scikit-Learn DBSCAN clustering
     (see docs: https://scikit-learn.org/stable/modules/generated/sklearn.cluster.DBSCAN.html)
 
@@ -184,9 +288,12 @@ def computeDBSCAN(filepath,maxdist=1,minsamples=5):
         filepath (str): path to LAS file
         mindist (int, optional): Maximum distance between two samples. Defaults to 1.
         minsamples (int, optional): Minimum number of samples in each cluster. Defaults to 5.
+        algorithm (str, optional): neighbors search algorithm. Defaults to 'ball_tree'.
+        leaf_size (int, optional): leaf size of the search tree. Defaults to 32.
+        n_jobs (int, optional): number of cpu used for neighbors search, no effect with metric='precomputed'. Defaults to 46.
     """
     data=lastools.readLAS(filepath)
-    model=DBSCAN(eps=maxdist,min_samples=minsamples,algorithm='kd_tree',leaf_size=1000,n_jobs=46).fit(data.XYZ)
+    model=DBSCAN(eps=maxdist,min_samples=minsamples,algorithm=algorithm,leaf_size=leaf_size,n_jobs=n_jobs).fit(data.XYZ)
     
     if len(np.unique(model.labels_))>1:
         extra=[(("labels","int16"),model.labels_)]
@@ -195,9 +302,9 @@ def computeDBSCAN(filepath,maxdist=1,minsamples=5):
     else:
         print("DBSCAN find only 1 cluster !")
 
-def computeDensity(points,core_points=[],radius=1,p_norm=2):
+def computeDensity(points,core_points=[],radius=1,p_norm=2,workers=-1):
     """counting points in neighborhood
-    With scipy.spatial.cKDTree
+    With scipy.spatial.KDTree, queries are run in parallel
 
     Args:
         data (numpy.ndarray): input coordinates
@@ -205,15 +312,16 @@ def computeDensity(points,core_points=[],radius=1,p_norm=2):
                                     If core_points is empty density will be calculted for all points.
         radius (float): neighbor searching radius
         p (integer): order of the norm for Minkowski distance. Default= 2
+        workers (integer): number of threads for queries, set 1 when called inside joblib Parallel. Default= -1 (all cpu)
 
     Returns:
         density (integer): number of points
     """
-    tree=cKDTree(points,leafsize=1000)
+    tree=scp.KDTree(points,leafsize=64,compact_nodes=True,balanced_tree=True)
     if len(core_points)==0:
-        core_points=np.copy(points)
+        core_points=points
 
-    return tree.query_ball_point(core_points,r=radius,p=p_norm,return_length=True)
+    return tree.query_ball_point(core_points,r=radius,p=p_norm,workers=workers,return_sorted=False,return_length=True)
     
 def merge_c2c_fwf(workspace,fichier):
     tab_fwf,metadata_fwf=lastools.readLAS(workspace+fichier,"fwf")
@@ -221,15 +329,23 @@ def merge_c2c_fwf(workspace,fichier):
     names_fwf=metadata_fwf['col_names']
     names_extra=metadata_extra['col_names']
     
-    controle=np.sqrt((tab_fwf[:,0]-tab_extra[:,0])**2+(tab_fwf[:,1]-tab_extra[:,1])**2+(tab_fwf[:,2]-tab_extra[:,2])**2)
-    try: assert(all(controle<0.003))
+    # squared distances compared to squared tolerance, no sqrt needed
+    diff=tab_fwf[:,0:3]-tab_extra[:,0:3]
+    controle=np.einsum('ij,ij->i',diff,diff)
+    try: assert(np.all(controle<0.003**2))
     except:
         raise Exception("LAS_FWF file and LAS file don't match exactly!\nPlease check your files...")
 
-    dist_Z=tab_extra[:,names_extra.index('c2c_absolute_distances_(z)')]
-    dist_plani=np.sqrt(np.power(tab_extra[:,names_extra.index('c2c_absolute_distances_(x)')],2)+np.power(tab_extra[:,names_extra.index('c2c_absolute_distances_(y)')],2))
+    idx_extra={name:i for i,name in enumerate(names_extra)}
+    dist_Z=tab_extra[:,idx_extra['c2c_absolute_distances_(z)']]
+    dist_plani=np.sqrt(np.power(tab_extra[:,idx_extra['c2c_absolute_distances_(x)']],2)+np.power(tab_extra[:,idx_extra['c2c_absolute_distances_(y)']],2))
     num=names_fwf.index("wave_packet_desc_index")
-    tab_tot=np.hstack([tab_extra[:,0:-4],tab_fwf[:,num::],np.reshape(dist_Z,(len(dist_Z),1)),np.reshape(dist_plani,(len(dist_plani),1))])
+    nb_extra,nb_fwf=tab_extra.shape[1]-4,tab_fwf.shape[1]-num
+    tab_tot=np.empty((len(tab_extra),nb_extra+nb_fwf+2),dtype=np.result_type(tab_extra,tab_fwf,dist_plani))
+    tab_tot[:,0:nb_extra]=tab_extra[:,0:-4]
+    tab_tot[:,nb_extra:nb_extra+nb_fwf]=tab_fwf[:,num::]
+    tab_tot[:,-2]=dist_Z
+    tab_tot[:,-1]=dist_plani
     names_tot=names_extra[0:-4]+names_fwf[num::]+['depth','distance_H']
     return tab_tot,names_tot,metadata_fwf['vlrs']
   
@@ -240,24 +356,32 @@ def select_pairs_overlap(filepath,shifts):
     for i in liste_files:
         data=lastools.readLAS(i)
         liste_num+=[str(os.path.split(i)[1][shifts[0]:shifts[0]+shifts[1]])]
-        pca_pts=PCA(n_components=2,svd_solver='full')
-        dat_new=pca_pts.fit_transform(data.XYZ[:,0:2])
+        # principal axes from the eigen decomposition of the 2x2 covariance matrix
+        center=np.mean(data.XYZ[:,0:2],axis=0)
+        xy=data.XYZ[:,0:2]-center
         del data
+        axes=np.linalg.eigh(xy.T@xy)[1]
+        dat_new=xy@axes
         
-        borne=np.array([[min(dat_new[:,0]),min(dat_new[:,1])],
-                        [min(dat_new[:,0]),max(dat_new[:,1])],
-                        [max(dat_new[:,0]),max(dat_new[:,1])],
-                        [max(dat_new[:,0]),min(dat_new[:,1])]])
-        borne_new=pca_pts.inverse_transform(borne)
+        mini,maxi=np.min(dat_new,axis=0),np.max(dat_new,axis=0)
+        borne=np.array([[mini[0],mini[1]],
+                        [mini[0],maxi[1]],
+                        [maxi[0],maxi[1]],
+                        [maxi[0],mini[1]]])
+        borne_new=borne@axes.T+center
         liste_polygon+=[Polygon(borne_new)]
 
+    # spatial index : only polygons with intersecting bounding boxes are tested
+    tree=STRtree(liste_polygon)
+    # query_items returns indices with shapely<2, query does with shapely>=2
+    query=getattr(tree,'query_items',tree.query)
     comparison={}
     for i in range(0,len(liste_polygon)-1):
         listing=[]
-        for c in range(i+1,len(liste_polygon)):
+        for c in sorted(c for c in query(liste_polygon[i]) if c>i):
             if liste_polygon[i].overlaps(liste_polygon[c]):
-                diff=liste_polygon[i].difference(liste_polygon[c])
-                if diff.area/liste_polygon[i].area<0.9:
+                inter=liste_polygon[i].intersection(liste_polygon[c])
+                if inter.area/liste_polygon[i].area>0.1:
                     listing+=[liste_num[c]]
 
         if len(listing)>0:
@@ -268,10 +392,15 @@ def select_pairs_overlap(filepath,shifts):
 def writeKML(filepath,names,descriptions,coordinates):
     try: assert(len(names)==len(descriptions) and len(names)==len(coordinates) and len(descriptions)==len(coordinates))
     except : print("Taille différente pour names, description et coords !!")
-    fichier=simplekml.Kml()
-    for i in names:
-        fichier.newpoint(name=i,description=descriptions[names.index(i)],coords=[coordinates[names.index(i)]])
-    fichier.save(filepath)
+    # KML is written as one string instead of building a simplekml object per point
+    placemarks="\n".join("<Placemark><name>"+escape(str(name))+"</name><description>"+escape(str(desc))+"</description>"
+                          "<Point><coordinates>"+",".join(str(c) for c in coord)+"</coordinates></Point></Placemark>"
+                          for name,desc,coord in zip(names,descriptions,coordinates))
+    with open(filepath,"w",encoding="utf-8") as fichier:
+        fichier.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      '<kml xmlns="http://www.opengis.net/kml/2.2"><Document>\n'
+                      +placemarks+
+                      '\n</Document></kml>\n')
     return True
 
 class ReverseTiling_mem(object):
@@ -296,15 +425,15 @@ class ReverseTiling_mem(object):
         print("done !")  
 
     def _get_ptSrcId(self,filename):
-        f=laspy.read(self.workspace+filename)
-        pts_srcid=np.unique(f.point_source_id)
+        # only point_source_id is decompressed (LAZ 1.4) and the tile is read by chunks
+        selection=laspy.DecompressionSelection.base()|laspy.DecompressionSelection.POINT_SOURCE_ID
+        pts_srcid=np.array([],dtype=np.uint16)
+        with laspy.open(self.workspace+filename,decompression_selection=selection) as f:
+            for chunk in f.chunk_iterator(1000000):
+                pts_srcid=np.union1d(pts_srcid,chunk.point_source_id)
         return [filename,pts_srcid]
 
-    def _mergeLines(self,key,maxLen,linenum=0):
-        query="lasmerge -i "
-        for filename in self.linesDict[key]:
-            query+=self.workspace+filename+" "
-
+    def _lineName(self,key,maxLen,linenum=0):
         if linenum==0:
             diff=maxLen-len(str(key))
             numLine=str(key)[0:-2]
@@ -312,9 +441,17 @@ class ReverseTiling_mem(object):
             numLine=str(linenum)
             diff=maxLen-len(numLine)
 
-        name=self.motif[0]+"0"*diff+numLine+self.motif[1]
-        query+="-keep_point_source "+str(key)+" -o "+self.workspace+name
-        utils.Run(query)
+        return self.motif[0]+"0"*diff+numLine+self.motif[1]
+
+    def _mergeLines(self,keys,name):
+        # keys sharing the same output name are merged one after the other, the last one is kept
+        for key in keys:
+            query="lasmerge -i "
+            for filename in self.linesDict[key]:
+                query+=self.workspace+filename+" "
+
+            query+="-keep_point_source "+str(key)+" -o "+self.workspace+name
+            utils.Run(query)
 
     def removeBuffer(self):
         os.mkdir(self.workspace+"new_tile")
@@ -323,39 +460,44 @@ class ReverseTiling_mem(object):
         self.workspace+="new_tile/"
 
     def searchingLines(self):
-        listNames=[os.path.split(i)[1] for i in glob.glob(self.workspace+"*.laz")]
-        result=Parallel(n_jobs=self.cores,verbose=0)(delayed(self._get_ptSrcId)(i) for i in listNames)
-        self.linesDict={}
-        for i in result:
-            for c in i[1]:
-                if c not in self.linesDict.keys():
-                    self.linesDict[c]=[i[0]]
-                else:
-                    self.linesDict[c]+=[i[0]]
+        with os.scandir(self.workspace) as entries:
+            listNames=[entry.name for entry in entries if entry.name.lower().endswith(".laz")]
+        # threads rather than processes : the default laz backend (LazrsParallel) already decompresses
+        # each tile on all cores, and processes would each start their own decompression thread pool
+        result=Parallel(n_jobs=self.cores,verbose=0,backend='threading')(delayed(self._get_ptSrcId)(i) for i in listNames)
+        self.linesDict=defaultdict(list)
+        for filename,pts_srcid in result:
+            for c in pts_srcid:
+                self.linesDict[c].append(filename)
 
     def writingLines(self,buffer):
         maxPtSrcId=len(str(max(self.linesDict.keys())))
         maxNumberLines=len(str(len(self.linesDict.keys())+1))
+        groups=defaultdict(list)
         if self.write_ptSrcId:
             for i in self.linesDict.keys():
-                print(i)
-                self._mergeLines(i,maxPtSrcId)
+                groups[self._lineName(i,maxPtSrcId)].append(i)
         else:
-            num=1
             list_ptsrcid=list(self.linesDict.keys())
             list_ptsrcid.sort()
-            for i in list_ptsrcid:
-                print(i)
-                self._mergeLines(i,maxNumberLines,num)
-                num+=1
+            for num,i in enumerate(list_ptsrcid,1):
+                groups[self._lineName(i,maxNumberLines,num)].append(i)
+
+        # one task per output file so that two lasmerge never write the same file,
+        # threads are enough since each task only waits for its subprocess
+        Parallel(n_jobs=self.cores,verbose=0,backend='threading')(delayed(self._mergeLines)(keys,name) for name,keys in groups.items())
 
         if buffer:
-            listNames=[os.path.split(i)[1] for i in glob.glob(self.workspace+self.motif[0])]
-            for filename in listNames:
+            # flightlines are moved to parent directory, lastile tiles (*_1.laz) are removed
+            with os.scandir(self.workspace) as entries:
+                listNames=[entry.name for entry in entries]
+            listTiles=[i for i in listNames if i.lower().endswith("_1.laz")]
+            listLines=[i for i in listNames if not i.lower().endswith("_1.laz") and i.lower().startswith(self.motif[0].lower()) and i.lower().endswith(self.motif[1].lower())]
+            for filename in listLines:
                 os.rename(self.workspace+filename,self.workspace[0:-9]+filename)
 
-            for filepath in glob.glob(self.workspace+"*_1.laz"):
-                os.remove(filepath)
+            for filename in listTiles:
+                os.remove(self.workspace+filename)
             os.rmdir(self.workspace)
 
 '''class ReverseTiling_fast(object):
@@ -5,7 +5,7 @@ import numpy as np
 import glob,os,time,shutil
 from joblib import Parallel,delayed
 
-def corbathy_discret(filepath,data_sbet):
+def corbathy_discret(filepath,data_sbet,workers=-1):
     offsetName=-10
     output_suffix="_corbathy"
     # Ouverture du fichier contenant la bathy
@@ -21,7 +21,7 @@ def corbathy_discret(filepath,data_sbet):
     
     # Calcul des nouvelles positions
     dataInterp=PL.sbet.interpolate(data_sbet[0],data_sbet[1],gpsTime)
-    coordsTrue,depthTrue=PL.calculs.correction3D(dataUnderWater.XYZ,depthApp,dataInterp[:,0:3])
+    coordsTrue,depthTrue=PL.calculs.correction3D(dataUnderWater.XYZ,depthApp,dataInterp[:,0:3],workers=workers)
     
     # Ecriture des résultats dans les fichiers LAS
     depthAll=np.concatenate((np.round(depthTrue,decimals=2),np.array([None]*len(dataAboveWater))))
@@ -30,14 +30,14 @@ def corbathy_discret(filepath,data_sbet):
     data_corbathy=PL.lastools.Merge_LAS([dataUnderWater,dataAboveWater])
     PL.lastools.writeLAS(filepath[0:offsetName]+output_suffix+".laz",data_corbathy,format_id=1,extraField=extra)
 
-def corbathy_fwf(filepath):
+def corbathy_fwf(filepath,workers=-1):
     offsetName=-10
     output_suffix="_corbathy"
     # Ouverture du fichier contenant la bathy
     inData=PL.lastools.readLAS_laspy(filepath,True)
 
     vectApp=np.vstack([inData.x_t,inData.y_t,inData.z_t]).transpose()
-    vectTrue_all=PL.calculs.correction_vect(vectApp)
+    vectTrue_all=PL.calculs.correction_vect(vectApp,workers=workers)
     inData.x_t,inData.y_t,inData.z_t=vectTrue_all[:,0],vectTrue_all[:,1],vectTrue_all[:,2]
     
     select=inData.depth<0.01
@@ -48,7 +48,7 @@ def corbathy_fwf(filepath):
 
     depthApp=dataUnderWater.depth
     # Calcul des nouvelles positions
-    coordsTrue,depthTrue=PL.calculs.correction3D(dataUnderWater.XYZ,depthApp,vectorApp=vectAppUnderWater)
+    coordsTrue,depthTrue=PL.calculs.correction3D(dataUnderWater.XYZ,depthApp,vectorApp=vectAppUnderWater,workers=workers)
     
     # Ecriture des résultats dans les fichiers LAS
     depthAll=np.concatenate((np.round(depthTrue,decimals=2),np.array([None]*len(dataAboveWater))))
@@ -96,7 +96,7 @@ if opt_fwf:
     if len(list_las_files)==1:
         corbathy_fwf(workspace+list_las_files[0])
     else:
-        Parallel(n_jobs=cores,verbose=1)(delayed(corbathy_fwf)(workspace+f) for f in list_las_files)
+        Parallel(n_jobs=cores,verbose=1)(delayed(corbathy_fwf)(workspace+f,1) for f in list_las_files)
 else:
     print("[Bathymetric correction] : SBET data processes, waiting...",end='\r')
     sbetTime,sbetCoords=PL.sbet.Sbet_config(workspace+file_sbet)
@@ -105,7 +105,7 @@ else:
     if len(list_las_files)==1:
         corbathy_discret(workspace+list_las_files[0],[sbetTime,sbetCoords])
     else:
-        Parallel(n_jobs=cores,verbose=1)(delayed(corbathy_discret)(workspace+f,[sbetTime,sbetCoords]) for f in list_las_files)
+        Parallel(n_jobs=cores,verbose=1)(delayed(corbathy_discret)(workspace+f,[sbetTime,sbetCoords],1) for f in list_las_files)
  
 fin=time.time()
 print("[Bathymetric correction] : Complete in "+str(round(fin-debut,1))+" sec")